@@ -1,193 +1,276 @@
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, request, jsonify
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
+from flask_compress import Compress
 import fitz  # PyMuPDF
-import json
+import orjson
 import re
-import pandas as pd
-from collections import defaultdict
+from bisect import bisect_left, bisect_right
 import os
-import tempfile
+from werkzeug.exceptions import HTTPException
 from werkzeug.utils import secure_filename
-import io
+import threading
+import hashlib
+import multiprocessing
+from collections import OrderedDict
+from functools import lru_cache
+from concurrent.futures import CancelledError, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import chain
 from datetime import datetime
 
+class OrjsonProvider(JSONProvider):
+    # jsonify through orjson; keys stay sorted like Flask's default provider
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, option=orjson.OPT_SORT_KEYS), mimetype="application/json"
+        )
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 
 CORS(app)
 
+# measurement payloads are highly repetitive JSON and gzip well
+Compress(app)
+
 @app.route('/')
 def home():
     return 'Hello, World!'
 
 app.config['MAX_CONTENT_LENGTH'] = 10 * 1024 * 1024
 
-ALLOWED_EXTENSIONS = {'pdf'}
+# Worker processes used to parse multi-file uploads in parallel. Disabled by
+# default because Vercel's serverless runtime cannot fork worker processes.
+app.config['PDF_PROCESS_WORKERS'] = int(os.environ.get('PDF_PROCESS_WORKERS', '0'))
+
+# Below this many measurement pages a single PDF is parsed in-process; forking
+# the work out costs more than it saves on short reports.
+app.config['PDF_PARALLEL_MIN_PAGES'] = 5
+
+# Parsed results kept per process for re-uploads of an identical file; 0 disables.
+app.config['PDF_RESULT_CACHE_SIZE'] = int(os.environ.get('PDF_RESULT_CACHE_SIZE', '64'))
+
+ALLOWED_EXTENSIONS = frozenset({'pdf'})
 
 def allowed_file(filename):
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+    _, dot, extension = filename.rpartition('.')
+    return bool(dot) and extension.lower() in ALLOWED_EXTENSIONS
 
-def extract_header_data(page_text):
-    header_info = {}
-    patterns = {
-        'supplier_name': r"Supplier name\s*(.*?)\s*Part No",
+# Free-text fields may wrap lines, hence DOTALL; the 200 character bound keeps
+# a missing terminator from dragging each search to the end of the page.
+_HEADER_PATTERNS = {
+    key: re.compile(pattern, re.DOTALL) for key, pattern in {
+        'supplier_name': r"Supplier name\s*(.{0,200}?)\s*Part No",
         'supplier_code': r"Supplier code No\.\s*(\S+)",
         'part_no': r"Part No\.\s*(\S+)",
-        'part_name': r"Part name\s*(.*?)\s*Tooling No",
+        'part_name': r"Part name\s*(.{0,200}?)\s*Tooling No",
         'tooling_no': r"Tooling No\.\s*(\S+)",
         'cavity_no': r"Cavity No\.\s*(\S+)",
-        'assy_name': r"ASSY \(SUB ASSY\) name\s*(.*?)\s*Material\s",
-        'material': r"Material\s*(.*?)\s*Drawing standard",
-        'material_manufacturer': r"Material manufacturer\s*(.*?)\s*Grade Name",
+        'assy_name': r"ASSY \(SUB ASSY\) name\s*(.{0,200}?)\s*Material\s",
+        'material': r"Material\s*(.{0,200}?)\s*Drawing standard",
+        'material_manufacturer': r"Material manufacturer\s*(.{0,200}?)\s*Grade Name",
         'grade_name': r"Grade Name\s*(\S+)",
         'dds2004_result': r"Result:\s*\[\s*(YES|NO)\s*\]"
-    }
-    
-    for key, pattern in patterns.items():
-        match = re.search(pattern, page_text, re.DOTALL)
-        if match:
-            header_info[key] = match.group(1).strip().replace('\n', ' ')
-        else:
-            header_info[key] = None
-            
-    # RoHS data extraction
-    rohs_data = {}
-    rohs_patterns = {
+    }.items()
+}
+
+_ROHS_PATTERNS = {
+    key: re.compile(pattern, re.DOTALL) for key, pattern in {
         'cd_result': r"Cd\s*<0\.01%\s*(Not Detected)",
         'hg_result': r"Hg\s*<0\.1%\s*(Not Detected)",
         'pb_result': r"Pb\s*<0\.1%\s*(Not Detected)",
         'cr6_result': r"Cr 6\+\s*<0\.1%\s*(Not Detected)"
-    }
-    for key, pattern in rohs_patterns.items():
-        match = re.search(pattern, page_text, re.DOTALL)
+    }.items()
+}
+
+# Column x positions of the two side-by-side measurement tables
+LEFT_COLUMNS = {
+    'no': 86,
+    'sym': 104,
+    'dimension': 127.27,
+    'upper': 150.30,
+    'lower': 174.78,
+    'pos': 197.87,
+    'measured_by_vendor': 226.36
+}
+
+RIGHT_COLUMNS = {
+    'no': 322.72,
+    'sym': 341.31,
+    'dimension': 363.33,
+    'upper': 387.57,
+    'lower': 411.51,
+    'pos': 434.54,
+    'measured_by_vendor': 463.03
+}
+
+# How far a word's top-left corner may sit from a cell's coordinate
+TOLERANCE_X = 15  # Horizontal tolerance
+TOLERANCE_Y = 6   # Vertical tolerance
+
+# (field names, x positions) of each table sorted by x, for bisect lookups
+LEFT_COLUMN_INDEX = (sorted(LEFT_COLUMNS, key=LEFT_COLUMNS.get), sorted(LEFT_COLUMNS.values()))
+RIGHT_COLUMN_INDEX = (sorted(RIGHT_COLUMNS, key=RIGHT_COLUMNS.get), sorted(RIGHT_COLUMNS.values()))
+
+# Ligatures are expanded to plain letters. Whitespace must stay preserved:
+# without it thin/en spaces split a cell like "12.5\u2009mm" into two words
+# and the second half lands in the next column
+_WORD_FLAGS = fitz.TEXTFLAGS_WORDS & ~fitz.TEXT_PRESERVE_LIGATURES
+
+_CAV_RE = re.compile(r'CAV-(\d+)', re.IGNORECASE)
+
+def extract_header_data(page_text):
+    header_info = {}
+    for key, pattern in _HEADER_PATTERNS.items():
+        match = pattern.search(page_text)
         if match:
-            rohs_data[key] = match.group(1).strip()
+            header_info[key] = match.group(1).strip().replace('\n', ' ')
         else:
-            rohs_data[key] = None
+            header_info[key] = None
+            
+    # RoHS data extraction; every pattern needs "Not Detected", so reports
+    # without it skip the regex scans
+    rohs_data = dict.fromkeys(_ROHS_PATTERNS)
+    if "Not Detected" in page_text:
+        for key, pattern in _ROHS_PATTERNS.items():
+            match = pattern.search(page_text)
+            if match:
+                rohs_data[key] = match.group(1).strip()
     
     header_info['rohs_data'] = rohs_data
     return header_info
 
-def get_text_at_coordinate(page, target_x, target_y, tolerance_x=15, tolerance_y=5):
-    words = page.get_text("words")
-    found_texts = []
+def get_text_at_coordinate(page, target_x, target_y, tolerance_x=15, tolerance_y=5, words=None):
+    if words is None:
+        words = page.get_text("words", flags=_WORD_FLAGS)
+    
+    # Nearest word wins; squared distance orders the same as the real one, and
+    # keeping the first strict minimum matches the old stable sort on ties
+    best_text = ""
+    best_distance = None
     
     for word in words:
         x0, y0, x1, y1, text, block_no, line_no, word_no = word
-        word_x = x0 
-        word_y = y0
+        dx = x0 - target_x
+        dy = y0 - target_y
         
-        if (abs(word_x - target_x) <= tolerance_x and 
-            abs(word_y - target_y) <= tolerance_y):
-            found_texts.append({
-                'text': text,
-                'x': word_x,
-                'y': word_y,
-                'distance': ((word_x - target_x)**2 + (word_y - target_y)**2)**0.5
-            })
+        if abs(dx) <= tolerance_x and abs(dy) <= tolerance_y:
+            distance = dx * dx + dy * dy
+            if best_distance is None or distance < best_distance:
+                best_distance = distance
+                best_text = text
     
-    if found_texts:
-        found_texts.sort(key=lambda x: x['distance'])
-        return found_texts[0]['text']
+    return best_text
+
+def get_sorted_page_words(page, clip=None):
+    # One text extraction per page, sorted by y so each table row can be
+    # sliced out with bisect instead of rescanning every word on the page
+    words = page.get_text("words", clip=clip, flags=_WORD_FLAGS)
+    words.sort(key=lambda w: w[1])
+    return words, [w[1] for w in words]
+
+def get_row_words(words, word_ys, current_y, tolerance_y):
+    return words[bisect_left(word_ys, current_y - tolerance_y):
+                 bisect_right(word_ys, current_y + tolerance_y)]
+
+def get_table_clip(page, start_y, row_height, num_rows, tolerance_y):
+    # Band covering every row the extractor looks at, plus one row height below
+    # the last row so words whose top edge is in range are not cut off
+    last_y = start_y + (num_rows - 1) * row_height
+    return fitz.Rect(0, start_y - tolerance_y, page.rect.width, last_y + tolerance_y + row_height)
+
+def read_table_row(page, columns, column_index, current_y, tolerance_x, tolerance_y, words):
+    # The row number is read first so blank, header and note rows are rejected
+    # after one lookup instead of one per column. Same test as ^\d+\.?\d*$,
+    # done with str methods rather than a regex call per row.
+    no = get_text_at_coordinate(page, columns['no'], current_y, tolerance_x, tolerance_y, words).strip()
+    head, _, tail = no.partition('.')
+    if not (head.isdecimal() and (not tail or tail.isdecimal())):
+        return None
+    
+    # Remaining columns in one pass over the row's words: bisect into the
+    # x-sorted column positions finds the (at most two) columns a word is
+    # within tolerance of, and the nearest word per column is kept
+    fields, column_xs = column_index
+    nearest = {}
+    for word in words:
+        x0, y0, text = word[0], word[1], word[4]
+        dy = y0 - current_y
+        if abs(dy) > tolerance_y:
+            continue
+        for i in range(bisect_left(column_xs, x0 - tolerance_x),
+                       bisect_right(column_xs, x0 + tolerance_x)):
+            dx = x0 - column_xs[i]
+            distance = dx * dx + dy * dy
+            field = fields[i]
+            if field not in nearest or distance < nearest[field][0]:
+                nearest[field] = (distance, text)
     
-    return ""
+    row_data = {'no': no}
+    for field in columns:
+        if field != 'no':
+            row_data[field] = nearest[field][1].strip() if field in nearest else ""
+    return row_data
 
 def extract_measurement_data_by_coordinates(page, start_y=180, row_height=12, num_rows=43):
     measurements = []
+    tolerance_x = TOLERANCE_X
+    tolerance_y = TOLERANCE_Y
     
-    left_columns = {
-        'no': 86,
-        'sym': 104, 
-        'dimension': 127.27,
-        'upper': 150.30,
-        'lower': 174.78,
-        'pos': 197.87,
-        'measured_by_vendor': 226.36
-    }
+    # headers, logos and footers outside the table never reach Python
+    words, word_ys = get_sorted_page_words(
+        page, get_table_clip(page, start_y, row_height, num_rows, tolerance_y))
     
-    right_columns = {
-        'no': 322.72,
-        'sym': 341.31,
-        'dimension': 363.33, 
-        'upper': 387.57,
-        'lower': 411.51,
-        'pos': 434.54,
-        'measured_by_vendor': 463.03
-    }
+    # cover, notes and RoHS pages have nothing inside the table band
+    if not words:
+        return measurements
     
-    tolerance_x = 15  # Horizontal tolerance
-    tolerance_y = 6   # Vertical tolerance 
+    # The gap between the two tables is far wider than tolerance_x, so a word
+    # left of this line can only ever match a left column and vice versa
+    mid_x = (LEFT_COLUMNS['measured_by_vendor'] + RIGHT_COLUMNS['no']) / 2
     
     for row in range(num_rows):
         current_y = start_y + (row * row_height)
         
-        # left side data
-        left_data = {}
-        for field, x_coord in left_columns.items():
-            text = get_text_at_coordinate(page, x_coord, current_y, tolerance_x, tolerance_y)
-            left_data[field] = text.strip() if text else ""
-        
-        # right side data
-        right_data = {}
-        for field, x_coord in right_columns.items():
-            text = get_text_at_coordinate(page, x_coord, current_y, tolerance_x, tolerance_y)
-            right_data[field] = text.strip() if text else ""
+        left_words, right_words = [], []
+        for word in get_row_words(words, word_ys, current_y, tolerance_y):
+            if word[0] < mid_x:
+                left_words.append(word)
+            else:
+                right_words.append(word)
         
         # left side measurement
-        if left_data['no'] and re.match(r'^\d+\.?\d*$', left_data['no']):
-            measurements.append({
-                "no": left_data['no'],
-                "sym": left_data['sym'],
-                "dimension": left_data['dimension'],
-                "upper": left_data['upper'], 
-                "lower": left_data['lower'],
-                "pos": left_data['pos'],
-                "measured_by_vendor": left_data['measured_by_vendor'],
-                "side": "left",
-                "row": row + 1
-            })
+        left_data = read_table_row(page, LEFT_COLUMNS, LEFT_COLUMN_INDEX, current_y, tolerance_x, tolerance_y, left_words)
+        if left_data:
+            left_data["side"] = "left"
+            left_data["row"] = row + 1
+            measurements.append(left_data)
         
         # right side measurement
-        if right_data['no'] and re.match(r'^\d+\.?\d*$', right_data['no']):
-            measurements.append({
-                "no": right_data['no'],
-                "sym": right_data['sym'], 
-                "dimension": right_data['dimension'],
-                "upper": right_data['upper'],
-                "lower": right_data['lower'], 
-                "pos": right_data['pos'],
-                "measured_by_vendor": right_data['measured_by_vendor'],
-                "side": "right",
-                "row": row + 1
-            })
+        right_data = read_table_row(page, RIGHT_COLUMNS, RIGHT_COLUMN_INDEX, current_y, tolerance_x, tolerance_y, right_words)
+        if right_data:
+            right_data["side"] = "right"
+            right_data["row"] = row + 1
+            measurements.append(right_data)
     
     return measurements
 
-def debug_coordinate_extraction(page, start_y=180, num_debug_rows=5):
+def debug_coordinate_extraction(page, start_y=180, num_debug_rows=5, row_height=12):
     debug_info = []
-    
-    # UPDATED COORDINATES
-    left_columns = {
-        'no': 86,
-        'sym': 104,
-        'dimension': 127.27, 
-        'upper': 150.30,
-        'lower': 174.78,
-        'pos': 197.87,
-        'measured_by_vendor': 226.36
-    }
-    
-    right_columns = {
-        'no': 322.72,
-        'sym': 341.31,
-        'dimension': 363.33,
-        'upper': 387.57,
-        'lower': 411.51,
-        'pos': 434.54,
-        'measured_by_vendor': 463.03
-    }
+    words, word_ys = get_sorted_page_words(
+        page, get_table_clip(page, start_y, row_height, num_debug_rows, TOLERANCE_Y))
     
     for row in range(num_debug_rows):
-        current_y = start_y + (row * 12) 
+        current_y = start_y + (row * row_height) 
+        row_words = get_row_words(words, word_ys, current_y, TOLERANCE_Y)
         
         row_debug = {
             'row': row + 1,
@@ -196,15 +279,15 @@ def debug_coordinate_extraction(page, start_y=180, num_debug_rows=5):
             'right_side': {}
         }
         
-        for field, x_coord in left_columns.items():
-            text = get_text_at_coordinate(page, x_coord, current_y, 15, 6)
+        for field, x_coord in LEFT_COLUMNS.items():
+            text = get_text_at_coordinate(page, x_coord, current_y, TOLERANCE_X, TOLERANCE_Y, row_words)
             row_debug['left_side'][field] = {
                 'coordinate': f"({x_coord}, {current_y})",
                 'found_text': text
             }
          
-        for field, x_coord in right_columns.items():
-            text = get_text_at_coordinate(page, x_coord, current_y, 15, 6)
+        for field, x_coord in RIGHT_COLUMNS.items():
+            text = get_text_at_coordinate(page, x_coord, current_y, TOLERANCE_X, TOLERANCE_Y, row_words)
             row_debug['right_side'][field] = {
                 'coordinate': f"({x_coord}, {current_y})",
                 'found_text': text
@@ -214,14 +297,31 @@ def debug_coordinate_extraction(page, start_y=180, num_debug_rows=5):
     
     return debug_info
 
+@lru_cache(maxsize=1024)
 def extract_cavity_number_from_filename(filename):
-    match = re.search(r'CAV-(\d+)', filename, re.IGNORECASE)
+    match = _CAV_RE.search(filename)
     if match:
         return f"CAV-{match.group(1)}"
     else:
         return os.path.splitext(os.path.basename(filename))[0]
 
-def process_pdf_data(pdf_data, filename):
+def close_pdf(doc):
+    # MuPDF keeps fonts and images from closed documents in its global store;
+    # emptying it stops a warm worker from carrying every past upload around
+    doc.close()
+    fitz.TOOLS.store_shrink(100)
+
+def extract_page_range_measurements(pdf_data, start, stop):
+    # Process pool worker: fitz documents can't be pickled or shared between
+    # threads, so each worker opens its own copy of the PDF once and extracts
+    # a contiguous run of pages from it
+    doc = fitz.open(stream=pdf_data, filetype="pdf")
+    try:
+        return [extract_measurement_data_by_coordinates(page) for page in doc.pages(start, stop)]
+    finally:
+        close_pdf(doc)
+
+def process_pdf_data(pdf_data, filename, pool=None, debug=False):
     try:
         doc = fitz.open(stream=pdf_data, filetype="pdf")
     except Exception as e:
@@ -229,37 +329,59 @@ def process_pdf_data(pdf_data, filename):
 
     cavity_id = extract_cavity_number_from_filename(filename)
     
-    first_page_text = doc[0].get_text("text")
-    header_data = extract_header_data(first_page_text)
-    
-    all_measurements = []
+    # first occurrence of each signature wins; dicts keep insertion order
+    unique = {}
     debug_info = []
     
-    for page_num in range(1, len(doc)):
-        page = doc[page_num]
+    try:
+        first_page_text = doc[0].get_text("text")
+        header_data = extract_header_data(first_page_text)
+        
+        page_results = None
+        num_pages = len(doc) - 1
+        if pool is not None and num_pages >= app.config['PDF_PARALLEL_MIN_PAGES']:
+            # one contiguous page range per worker
+            step = -(-num_pages // app.config['PDF_PROCESS_WORKERS'])
+            starts = range(1, len(doc), step)
+            stops = [min(start + step, len(doc)) for start in starts]
+            ranges = list(zip(starts, stops))
+            submitted = []
+            for start, stop in ranges:
+                job = submit_to_process_pool(pool, extract_page_range_measurements, pdf_data, start, stop)
+                if job is None:
+                    break
+                pool = job[0]
+                submitted.append(job)
+            
+            if len(submitted) == len(ranges):
+                page_results = list(chain.from_iterable(
+                    wait_for_process_pool(job, extract_page_range_measurements, pdf_data, start, stop)
+                    for job, (start, stop) in zip(submitted, ranges)))
+            else:
+                # no working pool would take the remaining ranges; parse the
+                # pages here, which is the path taken with the pool disabled
+                for _, future in submitted:
+                    future.cancel()
         
-        measurements_on_page = extract_measurement_data_by_coordinates(page)
-        if measurements_on_page:
-            all_measurements.extend(measurements_on_page)
+        if page_results is None:
+            page_results = (extract_measurement_data_by_coordinates(page) for page in doc.pages(1))
         
-        if page_num == 1:
+        for measurements_on_page in page_results:
+            for measurement in measurements_on_page:
+                signature = (measurement['no'], measurement['sym'], measurement['dimension'])
+                unique.setdefault(signature, measurement)
+        
+        if debug and len(doc) > 1:
             debug_info.append({
-                'page': page_num,
-                'coordinate_debug': debug_coordinate_extraction(page)
+                'page': 1,
+                'coordinate_debug': debug_coordinate_extraction(doc[1])
             })
+    finally:
+        close_pdf(doc)
 
-    unique_measurements = []
-    seen = set()
-    for measurement in all_measurements:
-        signature = (measurement['no'], measurement['sym'], measurement['dimension'])
-        if signature not in seen:
-            seen.add(signature)
-            unique_measurements.append(measurement)
-    
+    unique_measurements = list(unique.values())
     unique_measurements.sort(key=lambda x: int(x['no']) if x['no'].isdigit() else 0)
     
-    doc.close()
-    
     return {
         "cavity_id": cavity_id,
         "header_info": header_data,
@@ -267,6 +389,135 @@ def process_pdf_data(pdf_data, filename):
         "debug_info": debug_info
     }
 
+_process_pool = None
+_process_pool_lock = threading.Lock()
+
+def get_process_pool():
+    global _process_pool
+    workers = app.config['PDF_PROCESS_WORKERS']
+    if workers <= 1:
+        return None
+    with _process_pool_lock:
+        if _process_pool is None:
+            # forkserver rather than fork: workers start on the first submit(),
+            # inside a request thread, and a forked child could inherit MuPDF
+            # or logging locks held by another thread
+            _process_pool = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("forkserver"))
+    return _process_pool
+
+def discard_process_pool(pool):
+    # A worker died (OOM kill, MuPDF crash on a malformed PDF) and the executor
+    # refuses all further work; drop it so the next request builds a new one
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is pool:
+            _process_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+def submit_to_process_pool(pool, fn, *args):
+    # Returns (pool, future), or None if no pool will take the job. The pool a
+    # request was handed may since have broken or been shut down by another
+    # request, so a fresh one is fetched and tried once more.
+    for attempt in range(2):
+        try:
+            return pool, pool.submit(fn, *args)
+        except RuntimeError:
+            # BrokenProcessPool or "cannot schedule new futures after shutdown"
+            discard_process_pool(pool)
+            pool = get_process_pool()
+            if pool is None:
+                return None
+    return None
+
+def wait_for_process_pool(submitted, fn, *args):
+    # A dead worker breaks the whole executor and fails every job queued on it.
+    # Each affected job gets one retry on a fresh pool, waited on one at a
+    # time, and a job that kills that pool too raises here. Jobs are never
+    # re-run in the web process, where a PDF that crashes MuPDF or exhausts
+    # memory would take the server down.
+    pool, future = submitted
+    try:
+        return future.result()
+    except (BrokenProcessPool, CancelledError):
+        discard_process_pool(pool)
+    
+    retried = submit_to_process_pool(pool, fn, *args)
+    if retried is None:
+        raise BrokenProcessPool("No process pool available to retry the job")
+    pool, future = retried
+    try:
+        return future.result()
+    except BrokenProcessPool:
+        discard_process_pool(pool)
+        raise
+
+_result_cache = OrderedDict()
+_result_cache_lock = threading.Lock()
+
+def get_pdf_digest(pdf_data):
+    return hashlib.blake2b(pdf_data, digest_size=16).digest()
+
+def get_result_cache_key(pdf_data, filename, debug):
+    # filename decides the cavity id and debug adds debug_info, so both are
+    # part of the key alongside the content hash
+    return get_pdf_digest(pdf_data), filename, debug
+
+def get_cached_result(key):
+    with _result_cache_lock:
+        result = _result_cache.get(key)
+        if result is not None:
+            _result_cache.move_to_end(key)
+        return result
+
+def cache_result(key, result):
+    with _result_cache_lock:
+        _result_cache[key] = result
+        _result_cache.move_to_end(key)
+        while len(_result_cache) > app.config['PDF_RESULT_CACHE_SIZE']:
+            _result_cache.popitem(last=False)
+
+def process_pdf_jobs(jobs, debug=False):
+    # Yields (filename, result, error) for each (pdf_data, filename) job, in
+    # upload order. Files seen before are answered from the result cache. With
+    # the process pool enabled, several files are spread across workers file
+    # by file; a single file is split page by page instead.
+    pool = get_process_pool()
+    
+    keyed_jobs = []
+    to_parse = []
+    for pdf_data, filename in jobs:
+        key = get_result_cache_key(pdf_data, filename, debug)
+        cached = get_cached_result(key)
+        keyed_jobs.append((key, pdf_data, filename, cached))
+        if cached is None:
+            to_parse.append((key, pdf_data, filename))
+    
+    futures = {}
+    if pool is not None and len(to_parse) > 1:
+        for key, pdf_data, filename in to_parse:
+            if key not in futures:
+                job = submit_to_process_pool(pool, process_pdf_data, pdf_data, filename, None, debug)
+                if job is None:
+                    # files left unsubmitted are parsed in-process below
+                    pool = None
+                    break
+                pool = job[0]
+                futures[key] = job
+    
+    for key, pdf_data, filename, result in keyed_jobs:
+        if result is None:
+            try:
+                if key in futures:
+                    result = wait_for_process_pool(futures[key], process_pdf_data, pdf_data, filename, None, debug)
+                else:
+                    result = process_pdf_data(pdf_data, filename, pool, debug)
+            except Exception as e:
+                yield filename, None, e
+                continue
+            cache_result(key, result)
+        yield filename, result, None
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
     return jsonify({
@@ -286,22 +537,32 @@ def debug_coordinates_endpoint(cavity_id):
             return jsonify({"error": "Invalid file"}), 400
         
         pdf_data = file.read()
-        doc = fitz.open(stream=pdf_data, filetype="pdf")
-        
-        if len(doc) < 2:
-            return jsonify({"error": "PDF must have at least 2 pages"}), 400
         
-        page = doc[1] 
-        debug_data = debug_coordinate_extraction(page, num_debug_rows=10)
+        # repeated debug calls on the same PDF are served from the result cache
+        cache_key = (get_pdf_digest(pdf_data), 'debug-coordinates')
+        debug_data = get_cached_result(cache_key)
         
-        doc.close()
+        if debug_data is None:
+            doc = fitz.open(stream=pdf_data, filetype="pdf")
+            try:
+                if len(doc) < 2:
+                    return jsonify({"error": "PDF must have at least 2 pages"}), 400
+                
+                page = doc[1] 
+                debug_data = debug_coordinate_extraction(page, num_debug_rows=10)
+            finally:
+                close_pdf(doc)
+            
+            cache_result(cache_key, debug_data)
         
         return jsonify({
             "cavity_id": cavity_id,
             "debug_data": debug_data,
             "message": "Coordinate extraction debug information"
         })
-        
+    
+    except HTTPException:
+        raise
     except Exception as e:
         return jsonify({
             "error": "Debug failed",
@@ -329,6 +590,7 @@ def process_pdf():
         errors = []
         debug_mode = request.form.get('debug', 'false').lower() == 'true'
         
+        jobs = []
         for file in files:
             if file and file.filename != '':
                 filename = secure_filename(file.filename)
@@ -337,34 +599,34 @@ def process_pdf():
                     errors.append(f"{filename}: Invalid file type")
                     continue
                 
+                # MAX_CONTENT_LENGTH already caps the whole request at 10MB,
+                # so no single file can exceed it by the time we get here
                 try:
-                    pdf_data = file.read()
-                    
-                    if len(pdf_data) > 10 * 1024 * 1024: 
-                        errors.append(f"{filename}: File too large (>10MB)")
-                        continue
-                    
-                    result = process_pdf_data(pdf_data, filename)
-                    
-                    cavity_id = result["cavity_id"]
-                    data_entry = {
-                        "filename": filename,
-                        "header_info": result["header_info"],
-                        "measurements": result["measurements"],
-                        "extraction_method": "coordinate-based",
-                        "processed_at": datetime.now().isoformat()
-                    }
-                    
-                    if debug_mode:
-                        data_entry["debug_info"] = result["debug_info"]
-                    
-                    all_data[cavity_id] = data_entry
-                    successful_extractions += 1
-                    
+                    jobs.append((file.read(), filename))
                 except Exception as e:
                     errors.append(f"{filename}: {str(e)}")
                     continue
         
+        for filename, result, error in process_pdf_jobs(jobs, debug_mode):
+            if error is not None:
+                errors.append(f"{filename}: {str(error)}")
+                continue
+            
+            cavity_id = result["cavity_id"]
+            data_entry = {
+                "filename": filename,
+                "header_info": result["header_info"],
+                "measurements": result["measurements"],
+                "extraction_method": "coordinate-based",
+                "processed_at": datetime.now().isoformat()
+            }
+            
+            if debug_mode:
+                data_entry["debug_info"] = result["debug_info"]
+            
+            all_data[cavity_id] = data_entry
+            successful_extractions += 1
+        
         if successful_extractions == 0:
             return jsonify({
                 "error": "No files were successfully processed",
@@ -376,9 +638,10 @@ def process_pdf():
         quality_warnings = []
         for cavity_id, data in all_data.items():
             measurements = data['measurements']
+            # fields are stripped at extraction time, so emptiness is a plain truth test
             empty_fields_count = sum(1 for m in measurements 
-                                   for field in ['dimension', 'upper', 'lower', 'pos'] 
-                                   if not m.get(field, '').strip())
+                                   for field in ('dimension', 'upper', 'lower', 'pos') 
+                                   if not m[field])
             if measurements and empty_fields_count > len(measurements) * 0.1:  # More than 10% empty fields
                 quality_warnings.append(f"{cavity_id}: High number of empty measurement fields detected")
         
@@ -402,7 +665,10 @@ def process_pdf():
             response_data["quality_warnings"] = quality_warnings
         
         return jsonify(response_data)
-        
+    
+    except HTTPException:
+        # e.g. 413 from MAX_CONTENT_LENGTH when request.files is parsed
+        raise
     except Exception as e:
         return jsonify({
             "error": "Internal server error",
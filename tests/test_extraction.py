@@ -0,0 +1,178 @@
+# Regression checks for the fixed-coordinate ISIR extraction. PDFs are built
+# with PyMuPDF so every cell sits at a known position; run with `pytest`.
+import io
+import os
+import sys
+
+import fitz
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'api'))
+import index  # noqa: E402
+
+FIELDS = ('no', 'sym', 'dimension', 'upper', 'lower', 'pos', 'measured_by_vendor')
+FONT = fitz.Font('helv')
+FONTSIZE = 7
+
+HEADER_TEXT = [
+    "Supplier name ACME Plastics",
+    "Part No. P-1001",
+    "Supplier code No. S-77",
+    "Part name Front cover",
+    "Tooling No. T-9",
+    "Cavity No. 3",
+    "ASSY (SUB ASSY) name Cover assy",
+    "Material PC-ABS",
+    "Drawing standard JIS",
+    "Material manufacturer Covestro",
+    "Grade Name FR3010",
+    "Result: [ YES ]",
+    "Cd <0.01% Not Detected",
+    "Pb <0.1% Not Detected",
+]
+
+# (table row, side, cells); empty cells are not drawn. Cells are nudged off
+# their column coordinate, within tolerance, so the nearest-word lookup is
+# exercised rather than exact hits.
+PAGE_1 = [
+    (0, 'left', ('1', 'Ø', '12.5', '+0.1', '-0.1', 'A1', '12.48')),
+    (0, 'right', ('23', '', '4.0', '', '', 'B2', '4.01')),
+    (1, 'left', ('2', '', '12.5\u2009mm', '', '0.05', '', '12.51')),
+    (1, 'right', ('No.', 'Sym.', 'Dimension', '', '', '', '')),
+    (2, 'left', ('3.1', 'BURR', '0.2', '', '', 'C', 'OK')),
+    (42, 'right', ('40', 'R', '1.5', '+0.2', '0', 'D4', '1.55')),
+]
+
+PAGE_2 = [
+    (0, 'left', ('1', 'Ø', '12.5', '+0.1', '-0.1', 'A1', '99.99')),
+    (3, 'left', ('4', '', '7.25', '', '', 'E', '7.3')),
+]
+
+NUDGE = ((-3, -2), (-4, 2), (5, 0), (-2, -3), (0, 3), (4, 1), (-5, -1))
+
+
+def draw_row(page, row, side, cells):
+    columns = index.LEFT_COLUMNS if side == 'left' else index.RIGHT_COLUMNS
+    y = 180 + row * 12
+    writer = fitz.TextWriter(page.rect)
+    for (field, x), text, (dx, dy) in zip(columns.items(), cells, NUDGE):
+        if text:
+            # TextWriter places the baseline; shift it so the word's top edge
+            # lands at the intended coordinate
+            writer.append((x + dx, y + dy + FONT.ascender * FONTSIZE), text, font=FONT, fontsize=FONTSIZE)
+    writer.write_text(page)
+
+
+def build_pdf(*pages):
+    doc = fitz.open()
+    header = doc.new_page(width=595, height=842)
+    writer = fitz.TextWriter(header.rect)
+    for i, line in enumerate(HEADER_TEXT):
+        writer.append((40, 60 + i * 14), line, font=FONT, fontsize=9)
+    writer.write_text(header)
+    for rows in pages:
+        page = doc.new_page(width=595, height=842)
+        for row, side, cells in rows:
+            draw_row(page, row, side, cells)
+    return doc.tobytes()
+
+
+def expected(rows):
+    result = []
+    for row, side, cells in rows:
+        no = cells[0]
+        head, _, tail = no.partition('.')
+        if head.isdecimal() and (not tail or tail.isdecimal()):
+            result.append(dict(zip(FIELDS, cells), side=side, row=row + 1))
+    # the extractor emits left before right within each row
+    return sorted(result, key=lambda m: (m['row'], m['side'] != 'left'))
+
+
+@pytest.fixture
+def pdf_data():
+    return build_pdf(PAGE_1, PAGE_2)
+
+
+@pytest.fixture
+def process_pool(monkeypatch):
+    monkeypatch.setitem(index.app.config, 'PDF_PROCESS_WORKERS', 2)
+    monkeypatch.setitem(index.app.config, 'PDF_PARALLEL_MIN_PAGES', 2)
+    monkeypatch.setitem(index.app.config, 'PDF_RESULT_CACHE_SIZE', 0)
+    yield index.get_process_pool()
+    if index._process_pool is not None:
+        index.discard_process_pool(index._process_pool)
+
+
+def test_cells_are_read_at_fixed_coordinates(pdf_data):
+    doc = fitz.open(stream=pdf_data, filetype="pdf")
+    assert index.extract_measurement_data_by_coordinates(doc[1]) == expected(PAGE_1)
+    assert index.extract_measurement_data_by_coordinates(doc[2]) == expected(PAGE_2)
+
+
+def test_thin_space_does_not_split_a_cell(pdf_data):
+    doc = fitz.open(stream=pdf_data, filetype="pdf")
+    row = index.extract_measurement_data_by_coordinates(doc[1])[2]
+    assert (row['no'], row['dimension'], row['upper']) == ('2', '12.5\u2009mm', '')
+
+
+def test_header_fields(pdf_data):
+    doc = fitz.open(stream=pdf_data, filetype="pdf")
+    header = index.extract_header_data(doc[0].get_text("text"))
+    assert header['supplier_name'] == 'ACME Plastics'
+    assert header['part_no'] == 'P-1001'
+    assert header['material'] == 'PC-ABS'
+    assert header['material_manufacturer'] == 'Covestro'
+    assert header['dds2004_result'] == 'YES'
+    assert header['rohs_data'] == {
+        'cd_result': 'Not Detected',
+        'hg_result': None,
+        'pb_result': 'Not Detected',
+        'cr6_result': None,
+    }
+
+
+def test_measurements_are_deduplicated_and_sorted(pdf_data):
+    result = index.process_pdf_data(pdf_data, 'report_CAV-3.pdf')
+    assert result['cavity_id'] == 'CAV-3'
+    # page 2 repeats row 1 of page 1; the first occurrence wins
+    assert [(m['no'], m['measured_by_vendor']) for m in result['measurements']] == [
+        ('3.1', 'OK'), ('1', '12.48'), ('2', '12.51'), ('4', '7.3'), ('23', '4.01'), ('40', '1.55'),
+    ]
+
+
+def test_debug_coordinates_report_found_text(pdf_data):
+    doc = fitz.open(stream=pdf_data, filetype="pdf")
+    rows = index.debug_coordinate_extraction(doc[1], num_debug_rows=3)
+    assert [rows[0]['left_side'][f]['found_text'] for f in FIELDS] == list(PAGE_1[0][2])
+    assert rows[1]['right_side']['no']['found_text'] == 'No.'
+    assert rows[2]['right_side']['no']['found_text'] == ''
+
+
+def test_result_cache_serves_repeat_uploads(pdf_data, monkeypatch):
+    monkeypatch.setitem(index.app.config, 'PDF_PROCESS_WORKERS', 0)
+    first = list(index.process_pdf_jobs([(pdf_data, 'a_CAV-1.pdf')]))
+    second = list(index.process_pdf_jobs([(pdf_data, 'a_CAV-1.pdf')]))
+    assert first[0][2] is None
+    assert second[0][1] is first[0][1]
+
+
+def test_process_pool_matches_serial(pdf_data, process_pool):
+    other = build_pdf(PAGE_2)
+    serial = [index.process_pdf_data(pdf_data, 'a_CAV-1.pdf'), index.process_pdf_data(other, 'b_CAV-2.pdf')]
+
+    # several files go to workers file by file, a single one page by page
+    jobs = list(index.process_pdf_jobs([(pdf_data, 'a_CAV-1.pdf'), (other, 'b_CAV-2.pdf')]))
+    assert [(error, result) for _, result, error in jobs] == [(None, serial[0]), (None, serial[1])]
+    assert index.process_pdf_data(pdf_data, 'a_CAV-1.pdf', process_pool) == serial[0]
+
+    # a pool already shut down by another request is replaced, not fatal
+    index.discard_process_pool(process_pool)
+    assert index.process_pdf_data(pdf_data, 'a_CAV-1.pdf', process_pool) == serial[0]
+
+
+def test_oversized_upload_returns_413():
+    client = index.app.test_client()
+    upload = io.BytesIO(b'%PDF' + b'0' * index.app.config['MAX_CONTENT_LENGTH'])
+    response = client.post('/api/process-pdf', data={'files': (upload, 'big.pdf')},
+                           content_type='multipart/form-data')
+    assert response.status_code == 413